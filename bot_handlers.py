@@ -2,17 +2,17 @@
 Telegram bot handlers for ShopSavvy deal finder bot
 """
 import logging
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update
 from telegram.ext import ContextTypes, ConversationHandler
 from telegram.constants import ParseMode
 
-from config import PLATFORM_SELECTION, PRODUCT_SEARCH, CATEGORY_SEARCH, DEAL_TYPE_SELECTION
-from mock_data import search_products, MOCK_PRODUCTS
+import stats
+from config import PLATFORM_SELECTION, PRODUCT_SEARCH, CATEGORY_SEARCH
+from mock_data import search_products
 from utils import (
     format_deal_message, format_trending_deals, format_festival_deals,
-    create_platform_keyboard, create_category_keyboard, 
-    create_deal_type_keyboard, create_main_menu_keyboard, 
-    get_product_link, create_product_link_keyboard
+    create_platform_keyboard, create_category_keyboard,
+    create_main_menu_keyboard, create_product_link_keyboard
 )
 
 logger = logging.getLogger(__name__)
@@ -32,6 +32,7 @@ What would you like to do today?
     """
     
     keyboard = create_main_menu_keyboard()
+    stats.track_user(update.effective_user.id)
     
     await update.message.reply_text(
         welcome_message.strip(),
@@ -87,80 +88,80 @@ async def deals_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         parse_mode=ParseMode.MARKDOWN
     )
 
-async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle button callbacks"""
-    query = update.callback_query
-    await query.answer()
-    
-    data = query.data
-    
-    if data.startswith('platform_'):
-        platform = data.replace('platform_', '')
-        context.user_data['selected_platform'] = platform
-        
-        await query.edit_message_text(
-            f"✅ Selected: {platform.title() if platform != 'all' else 'All Platforms'}\n\n"
-            f"Now, what product are you looking for?\n"
-            f"💡 Try: smartphones, shirts, home appliances, electronics",
-            parse_mode=ParseMode.MARKDOWN
-        )
-        return PRODUCT_SEARCH
-    
-    elif data == 'search_products':
-        keyboard = create_platform_keyboard()
-        await query.edit_message_text(
-            "🏪 **Choose Platform** 🏪\n\n"
-            "Would you like to search one platform or compare deals across all?",
-            reply_markup=keyboard,
-            parse_mode=ParseMode.MARKDOWN
-        )
-        return PLATFORM_SELECTION
-    
-    elif data == 'browse_categories':
-        keyboard = create_category_keyboard()
-        await query.edit_message_text(
-            "📂 **Browse by Category** 📂\n\n"
-            "Select a category to explore:",
-            reply_markup=keyboard,
-            parse_mode=ParseMode.MARKDOWN
-        )
-        return CATEGORY_SEARCH
+async def _on_platform(query, context):
+    """Remember the chosen platform and ask for a product"""
+    platform = query.data.replace('platform_', '')
+    context.user_data['selected_platform'] = platform
     
-    elif data.startswith('category_'):
-        category = data.replace('category_', '').replace('_', ' ')
-        context.user_data['selected_category'] = category
-        
-        keyboard = create_platform_keyboard()
-        await query.edit_message_text(
-            f"📂 **Category:** {category.title()}\n\n"
-            f"🏪 **Choose Platform:**",
-            reply_markup=keyboard,
-            parse_mode=ParseMode.MARKDOWN
-        )
-        return PLATFORM_SELECTION
+    await query.edit_message_text(
+        f"✅ Selected: {platform.title() if platform != 'all' else 'All Platforms'}\n\n"
+        f"Now, what product are you looking for?\n"
+        f"💡 Try: smartphones, shirts, home appliances, electronics",
+        parse_mode=ParseMode.MARKDOWN
+    )
+    return PRODUCT_SEARCH
+
+async def _on_search_products(query, context):
+    """Show the platform picker"""
+    keyboard = create_platform_keyboard()
+    await query.edit_message_text(
+        "🏪 **Choose Platform** 🏪\n\n"
+        "Would you like to search one platform or compare deals across all?",
+        reply_markup=keyboard,
+        parse_mode=ParseMode.MARKDOWN
+    )
+    return PLATFORM_SELECTION
+
+async def _on_browse_categories(query, context):
+    """Show the category picker"""
+    keyboard = create_category_keyboard()
+    await query.edit_message_text(
+        "📂 **Browse by Category** 📂\n\n"
+        "Select a category to explore:",
+        reply_markup=keyboard,
+        parse_mode=ParseMode.MARKDOWN
+    )
+    return CATEGORY_SEARCH
+
+async def _on_category(query, context):
+    """Remember the chosen category and show the platform picker"""
+    category = query.data.replace('category_', '').replace('_', ' ')
+    context.user_data['selected_category'] = category
     
-    elif data == 'trending_deals':
-        trending_message = format_trending_deals()
-        keyboard = create_main_menu_keyboard()
-        
-        await query.edit_message_text(
-            trending_message,
-            reply_markup=keyboard,
-            parse_mode=ParseMode.MARKDOWN
-        )
+    keyboard = create_platform_keyboard()
+    await query.edit_message_text(
+        f"📂 **Category:** {category.title()}\n\n"
+        f"🏪 **Choose Platform:**",
+        reply_markup=keyboard,
+        parse_mode=ParseMode.MARKDOWN
+    )
+    return PLATFORM_SELECTION
+
+async def _on_trending_deals(query, context):
+    """Show trending deals"""
+    trending_message = format_trending_deals()
+    keyboard = create_main_menu_keyboard()
     
-    elif data == 'festival_deals':
-        festival_message = format_festival_deals()
-        keyboard = create_main_menu_keyboard()
-        
-        await query.edit_message_text(
-            festival_message,
-            reply_markup=keyboard,
-            parse_mode=ParseMode.MARKDOWN
-        )
+    await query.edit_message_text(
+        trending_message,
+        reply_markup=keyboard,
+        parse_mode=ParseMode.MARKDOWN
+    )
+
+async def _on_festival_deals(query, context):
+    """Show upcoming festival sales"""
+    festival_message = format_festival_deals()
+    keyboard = create_main_menu_keyboard()
     
-    elif data == 'help':
-        help_text = """
+    await query.edit_message_text(
+        festival_message,
+        reply_markup=keyboard,
+        parse_mode=ParseMode.MARKDOWN
+    )
+
+async def _on_help(query, context):
+    """Show the help text"""
+    help_text = """
 🤖 **ShopSavvy Help** 🤖
 
 **Commands:**
@@ -182,25 +183,48 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 🎉 Festival sale alerts
 
 Need help? Just type your product name!
-        """
-        
-        keyboard = create_main_menu_keyboard()
-        
-        await query.edit_message_text(
-            help_text.strip(),
-            reply_markup=keyboard,
-            parse_mode=ParseMode.MARKDOWN
-        )
+    """
     
-    elif data.startswith('dealtype_'):
-        deal_type = data.replace('dealtype_', '').replace('_', ' ')
-        
-        await query.edit_message_text(
-            f"✅ Looking for: {deal_type.title()}\n\n"
-            f"This feature will be available in the next update! 🚀\n\n"
-            f"For now, try searching for specific products.",
-            parse_mode=ParseMode.MARKDOWN
-        )
+    keyboard = create_main_menu_keyboard()
+    
+    await query.edit_message_text(
+        help_text.strip(),
+        reply_markup=keyboard,
+        parse_mode=ParseMode.MARKDOWN
+    )
+
+async def _on_deal_type(query, context):
+    """Acknowledge a deal type choice"""
+    deal_type = query.data.replace('dealtype_', '').replace('_', ' ')
+    
+    await query.edit_message_text(
+        f"✅ Looking for: {deal_type.title()}\n\n"
+        f"This feature will be available in the next update! 🚀\n\n"
+        f"For now, try searching for specific products.",
+        parse_mode=ParseMode.MARKDOWN
+    )
+
+# Callback handlers keyed by the callback data prefix before the first '_'
+CALLBACK_HANDLERS = {
+    'platform': _on_platform,
+    'search': _on_search_products,
+    'browse': _on_browse_categories,
+    'category': _on_category,
+    'trending': _on_trending_deals,
+    'festival': _on_festival_deals,
+    'help': _on_help,
+    'dealtype': _on_deal_type
+}
+
+async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle button callbacks"""
+    query = update.callback_query
+    await query.answer()
+    
+    handler = CALLBACK_HANDLERS.get(query.data.split('_', 1)[0])
+    if handler is None:
+        return None
+    return await handler(query, context)
 
 async def handle_product_search(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle product search input"""
@@ -219,6 +243,8 @@ async def handle_product_search(update: Update, context: ContextTypes.DEFAULT_TY
     try:
         # Search products
         results = search_products(search_query, platform)
+        stats.inc_search()
+        stats.track_user(update.effective_user.id)
         
         if not results:
             keyboard = create_main_menu_keyboard()
@@ -254,6 +280,7 @@ async def handle_product_search(update: Update, context: ContextTypes.DEFAULT_TY
                         reply_markup=product_keyboard,
                         parse_mode=ParseMode.MARKDOWN
                     )
+                    stats.inc_image()
                 else:
                     # Fallback to text message if no image
                     await update.message.reply_text(
@@ -262,7 +289,7 @@ async def handle_product_search(update: Update, context: ContextTypes.DEFAULT_TY
                         parse_mode=ParseMode.MARKDOWN
                     )
             except Exception as e:
-                logger.error(f"Error sending image for {product['name']}: {e}")
+                logger.error("Error sending image for %s: %s", product['name'], e)
                 # Fallback to text message
                 await update.message.reply_text(
                     f"**Deal {i}/{len(results)}**\n\n{deal_message}",
@@ -282,7 +309,7 @@ async def handle_product_search(update: Update, context: ContextTypes.DEFAULT_TY
         context.user_data.clear()
         
     except Exception as e:
-        logger.error(f"Error in product search: {e}")
+        logger.error("Error in product search: %s", e)
         keyboard = create_main_menu_keyboard()
         await update.message.reply_text(
             "❌ **Oops! Something went wrong** ❌\n\n"
@@ -330,6 +357,8 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
     
     # Search across all platforms by default
     results = search_products(query, 'all')
+    stats.inc_search()
+    stats.track_user(update.effective_user.id)
     
     if not results:
         keyboard = create_main_menu_keyboard()
@@ -358,6 +387,7 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                     reply_markup=keyboard,
                     parse_mode=ParseMode.MARKDOWN
                 )
+                stats.inc_image()
             else:
                 # Fallback to text message if no image
                 await update.message.reply_text(
@@ -366,7 +396,7 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                     parse_mode=ParseMode.MARKDOWN
                 )
         except Exception as e:
-            logger.error(f"Error sending image for {product['name']}: {e}")
+            logger.error("Error sending image for %s: %s", product['name'], e)
             # Fallback to text message
             await update.message.reply_text(
                 f"**Result {i}/{len(results)}**\n\n{deal_message}",
@@ -377,11 +407,10 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
 # Error handler
 async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE):
     """Handle errors"""
-    logger.error(f'Update {update} caused error {context.error}')
+    logger.error('Update %s caused error %s', update, context.error)
     
     try:
         if update and hasattr(update, 'message') and update.message:
-            from utils import create_main_menu_keyboard
             await update.message.reply_text(
                 "❌ **Something went wrong!**\n\n"
                 "Please try again or contact support if the issue persists.",
@@ -391,4 +420,4 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE):
         elif update and hasattr(update, 'callback_query') and update.callback_query:
             await update.callback_query.answer("Something went wrong! Please try again.")
     except Exception as e:
-        logger.error(f"Error in error handler: {e}")
+        logger.error("Error in error handler: %s", e)
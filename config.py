@@ -2,27 +2,60 @@
 Configuration file for the Telegram bot (Render.com compatible)
 """
 import os
+import re
 import logging
+from functools import lru_cache
+from types import MappingProxyType
+
+from logging_setup import configure
+
+# ======================
+# Environment Helpers
+# ======================
+@lru_cache(maxsize=None)
+def _env(key, default=None):
+    """Read an environment variable once and cache it for the process"""
+    return os.environ.get(key, default)
+
+def _as_int(key, default):
+    """Read an integer environment variable, falling back to default"""
+    try:
+        return int(_env(key) or default)
+    except ValueError:
+        return default
+
+def _as_bool(key, default=False):
+    """Read a boolean environment variable ('true', '1', 'yes')"""
+    value = _env(key)
+    if value is None:
+        return default
+    return value.strip().lower() in ('true', '1', 'yes')
 
 # ======================
 # Bot Configuration
 # ======================
-BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
+BOT_TOKEN = _env("TELEGRAM_BOT_TOKEN", "")
 WEBAPP_HOST = "0.0.0.0"  # Required for Render.com
-WEBAPP_PORT = int(os.getenv("PORT", 5000))  # Render provides PORT environment variable
+WEBAPP_PORT = _as_int("PORT", 5000)  # Render provides PORT environment variable
 
 # Webhook Configuration
-WEBHOOK_URL = os.getenv("WEBHOOK_URL", "")  # Set this in Render.com environment variables
+WEBHOOK_URL = _env("WEBHOOK_URL", "")  # Set this in Render.com environment variables
 WEBHOOK_PATH = f"/templates/index.html/{BOT_TOKEN}"  # Unique path for your webhook
 WEBHOOK_URL_FULL = f"{WEBHOOK_URL}{WEBHOOK_PATH}" if WEBHOOK_URL else ""
 
+# Render.com Configuration
+# An empty RENDER value counts as unset
+IS_RENDER = bool(_env("RENDER"))
+RENDER_EXTERNAL_HOSTNAME = _env("RENDER_EXTERNAL_HOSTNAME", "")
+RENDER_WEBHOOK_URL = f"https://{RENDER_EXTERNAL_HOSTNAME}/{BOT_TOKEN}"
+WEBHOOK_PORT = _as_int("PORT", 8443)  # Telegram webhook listener, 8443 when PORT is unset
+
 # ======================
 # Logging Configuration
 # ======================
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
+DEBUG = _as_bool("DEBUG")
+
+configure(DEBUG)
 logger = logging.getLogger(__name__)
 
 # ======================
@@ -31,32 +64,41 @@ logger = logging.getLogger(__name__)
 (PLATFORM_SELECTION, PRODUCT_SEARCH, CATEGORY_SEARCH, 
  DEAL_TYPE_SELECTION, PRICE_ALERT) = range(5)
 
+# Callback data patterns, compiled once and matched on every button press
+CB_ENTRY = re.compile(
+    r'^(?:search_products|browse_categories|platform_[a-z]+|category_[a-z_&]+)$',
+    re.ASCII
+)
+CB_PLATFORM = re.compile(r'^platform_[a-z]+$', re.ASCII)
+CB_CATEGORY = re.compile(r'^category_[a-z_&]+$', re.ASCII)
+
 # ======================
 # Platform Configuration
 # ======================
-PLATFORM_EMOJIS = {
+# Read-only so handlers can't mutate shared lookup tables at runtime
+PLATFORM_EMOJIS = MappingProxyType({
     'flipkart': '🛒',
     'amazon': '📦',
     'meesho': '🛍️',
     'myntra': '👗',
     'all': '🔍'
-}
+})
 
-CATEGORIES = [
+CATEGORIES = (
     'Mobile', 'Television', 'Shirt', 'Electronics', 'Fashion', 
     'Home & Kitchen', 'Books', 'Sports & Fitness', 
     'Beauty & Personal Care', 'Automotive'
-]
+)
 
-DEAL_TYPES = [
+DEAL_TYPES = (
     'Percentage Discounts', 'BOGO Offers', 'Bank Discounts', 
     'Clearance Sales', 'Cashback Offers'
-]
+)
 
 # ======================
 # Database Configuration
 # ======================
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///deals.db")  # For Render PostgreSQL
+DATABASE_URL = _env("DATABASE_URL", "sqlite:///deals.db")  # For Render PostgreSQL
 
 # ======================
 # Deployment Checks
@@ -0,0 +1,23 @@
+"""
+Logging setup shared by the bot, the dashboard and the startup scripts
+"""
+import logging
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_configured = False
+
+def configure(debug=False):
+    """Configure root logging once; later calls can only enable debug output"""
+    global _configured
+
+    if _configured:
+        if debug:
+            logging.getLogger().setLevel(logging.DEBUG)
+        return
+    _configured = True
+
+    logging.basicConfig(
+        format=LOG_FORMAT,
+        level=logging.DEBUG if debug else logging.INFO
+    )
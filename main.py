@@ -3,50 +3,35 @@
 ShopSavvy - Telegram Bot for Finding Deals Across Indian E-commerce Platforms
 '''
 import logging
-import os
-from telegram.ext import (
-    Application, CommandHandler, CallbackQueryHandler, 
-    ConversationHandler, MessageHandler, filters
-)
 
-from config import BOT_TOKEN, PLATFORM_SELECTION, PRODUCT_SEARCH, CATEGORY_SEARCH
-from bot_handlers import (
-    start, help_command, deals_command, button_callback,
-    handle_product_search, handle_invalid_input, cancel_conversation,
-    handle_text_message, error_handler
+from config import (
+    BOT_TOKEN, WEBAPP_HOST, WEBHOOK_PORT, IS_RENDER, RENDER_WEBHOOK_URL,
+    PLATFORM_SELECTION, PRODUCT_SEARCH, CATEGORY_SEARCH,
+    CB_ENTRY, CB_PLATFORM, CB_CATEGORY
 )
-# webhook templates
-from flask import Flask, render_template
-import os
-
-app = Flask(__name__, template_folder='templates')
-
-@app.route('/')
-def homepage():
-    return render_template('index.html')
 
-@app.route('/health')
-def health_check():
-    return "✅ Server is running", 200
-
-if __name__ == '__main__':
-    port = int(os.environ.get('PORT', 5000))  # Default to port 5000
-    app.run(host='0.0.0.0', port=port)
-    
-# Enable logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
+# Logging is configured when config is imported
 logger = logging.getLogger(__name__)
 
-def main():
-    """Main function to run the bot"""
+# Update types the bot subscribes to
+ALLOWED_UPDATES = ['message', 'callback_query']
+
+def build_application():
+    """Create the Telegram application with all handlers registered"""
+    from telegram.ext import (
+        Application, CommandHandler, CallbackQueryHandler,
+        ConversationHandler, MessageHandler, filters
+    )
+    from bot_handlers import (
+        start, help_command, deals_command, button_callback,
+        handle_product_search, handle_invalid_input, cancel_conversation,
+        handle_text_message, error_handler
+    )
     
     # Validate bot token
     if BOT_TOKEN == "your_bot_token_here":
         logger.error("Please set TELEGRAM_BOT_TOKEN environment variable")
-        return
+        return None
     
     # Create application
     app = Application.builder().token(BOT_TOKEN).build()
@@ -55,17 +40,17 @@ def main():
     conversation_handler = ConversationHandler(
         entry_points=[
             CommandHandler('start', start),
-            CallbackQueryHandler(button_callback, pattern='^(search_products|browse_categories|platform_|category_).*$')
+            CallbackQueryHandler(button_callback, pattern=CB_ENTRY)
         ],
         states={
             PLATFORM_SELECTION: [
-                CallbackQueryHandler(button_callback, pattern='^platform_.*$')
+                CallbackQueryHandler(button_callback, pattern=CB_PLATFORM)
             ],
             PRODUCT_SEARCH: [
                 MessageHandler(filters.TEXT & ~filters.COMMAND, handle_product_search)
             ],
             CATEGORY_SEARCH: [
-                CallbackQueryHandler(button_callback, pattern='^category_.*$')
+                CallbackQueryHandler(button_callback, pattern=CB_CATEGORY)
             ]
         },
         fallbacks=[
@@ -85,35 +70,61 @@ def main():
     # Add error handler
     app.add_error_handler(error_handler)
     
+    return app
+
+async def start_updater(app):
+    """Start receiving updates for an already started application
+
+    On Render this only registers the webhook with Telegram; the caller's web
+    server must serve /<BOT_TOKEN> and feed updates into app.update_queue.
+    """
+    if IS_RENDER:
+        # Webhook configuration for Render
+        await app.bot.set_webhook(
+            RENDER_WEBHOOK_URL,
+            allowed_updates=ALLOWED_UPDATES,
+            drop_pending_updates=True
+        )
+        logger.info("🌐 Webhook configured at %s", RENDER_WEBHOOK_URL)
+    else:
+        # Use polling for local development
+        await app.updater.start_polling(
+            allowed_updates=ALLOWED_UPDATES,
+            drop_pending_updates=True
+        )
+        logger.info("🔌 Using polling method (local development)")
+
+def main():
+    """Main function to run the bot"""
+    app = build_application()
+    if app is None:
+        return
+    
     logger.info("🤖 ShopSavvy Bot is starting...")
     logger.info("🔍 Ready to help users find the best deals!")
 
-    # Get port from environment variable or use default
-    port = int(os.environ.get('PORT', 8443))
-            
     # Start the bot
     try:
-        if 'RENDER' in os.environ:
+        if IS_RENDER:
             # Webhook configuration for Render
-            webhook_url = f"https://{os.environ.get('RENDER_EXTERNAL_HOSTNAME')}/{BOT_TOKEN}"
             app.run_webhook(
-                listen="0.0.0.0",
-                port=port,
-                webhook_url=webhook_url,
+                listen=WEBAPP_HOST,
+                port=WEBHOOK_PORT,
+                webhook_url=RENDER_WEBHOOK_URL,
                 url_path=BOT_TOKEN,
-                allowed_updates=['message', 'callback_query'],
+                allowed_updates=ALLOWED_UPDATES,
                 drop_pending_updates=True
             )
-            logger.info(f"🌐 Webhook configured at {webhook_url}")
+            logger.info("🌐 Webhook configured at %s", RENDER_WEBHOOK_URL)
         else:
             # Use polling for local development
             app.run_polling(
-                allowed_updates=['message', 'callback_query'],
+                allowed_updates=ALLOWED_UPDATES,
                 drop_pending_updates=True
             )
             logger.info("🔌 Using polling method (local development)")
     except Exception as e:
-        logger.error(f"Failed to start bot: {e}")
+        logger.error("Failed to start bot: %s", e)
         logger.info("Make sure TELEGRAM_BOT_TOKEN is set correctly")
 
 if __name__ == '__main__':
@@ -1,8 +1,6 @@
 """
 Mock data for e-commerce deals across Indian platforms
 """
-import random
-from datetime import datetime, timedelta
 
 # Mock product database
 MOCK_PRODUCTS = {
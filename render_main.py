@@ -4,7 +4,7 @@ ShopSavvy - Telegram Bot for Finding Deals Across Indian E-commerce Platforms
 Render.com deployment version with webhook support
 """
 import logging
-import os
+import orjson
 from flask import Flask, request
 from telegram import Update
 from telegram.ext import (
@@ -12,18 +12,18 @@ from telegram.ext import (
     ConversationHandler, MessageHandler, filters
 )
 
-from config import BOT_TOKEN, PLATFORM_SELECTION, PRODUCT_SEARCH, CATEGORY_SEARCH
+from config import (
+    BOT_TOKEN, WEBAPP_HOST, WEBAPP_PORT, IS_RENDER, RENDER_EXTERNAL_HOSTNAME,
+    PLATFORM_SELECTION, PRODUCT_SEARCH, CATEGORY_SEARCH,
+    CB_ENTRY, CB_PLATFORM, CB_CATEGORY
+)
 from bot_handlers import (
     start, help_command, deals_command, button_callback,
     handle_product_search, handle_invalid_input, cancel_conversation,
     handle_text_message, error_handler
 )
 
-# Enable logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
+# Logging is configured when config is imported
 logger = logging.getLogger(__name__)
 
 # Flask app for webhook
@@ -32,6 +32,9 @@ app = Flask(__name__)
 # Global application instance
 telegram_app = None
 
+# Public URL of the /webhook route, resolved once at startup
+RENDER_WEBHOOK_PATH_URL = f"https://{RENDER_EXTERNAL_HOSTNAME or 'localhost'}/webhook"
+
 def create_telegram_app():
     """Create and configure the Telegram application"""
     global telegram_app
@@ -48,17 +51,17 @@ def create_telegram_app():
     conversation_handler = ConversationHandler(
         entry_points=[
             CommandHandler('start', start),
-            CallbackQueryHandler(button_callback, pattern='^(search_products|browse_categories|platform_|category_).*$')
+            CallbackQueryHandler(button_callback, pattern=CB_ENTRY)
         ],
         states={
             PLATFORM_SELECTION: [
-                CallbackQueryHandler(button_callback, pattern='^platform_.*$')
+                CallbackQueryHandler(button_callback, pattern=CB_PLATFORM)
             ],
             PRODUCT_SEARCH: [
                 MessageHandler(filters.TEXT & ~filters.COMMAND, handle_product_search)
             ],
             CATEGORY_SEARCH: [
-                CallbackQueryHandler(button_callback, pattern='^category_.*$')
+                CallbackQueryHandler(button_callback, pattern=CB_CATEGORY)
             ]
         },
         fallbacks=[
@@ -87,8 +90,8 @@ def webhook():
         return "Bot not initialized", 500
         
     try:
-        # Get the JSON data
-        json_data = request.get_json()
+        # Decode the raw body straight from bytes
+        json_data = orjson.loads(request.get_data())
         
         # Create Update object
         update = Update.de_json(json_data, telegram_app.bot)
@@ -98,7 +101,7 @@ def webhook():
         
         return "OK", 200
     except Exception as e:
-        logger.error(f"Error processing webhook: {e}")
+        logger.error("Error processing webhook: %s", e)
         return "Error", 500
 
 @app.route('/health')
@@ -108,7 +111,7 @@ def health():
         "status": "healthy",
         "bot": "ShopSavvy",
         "version": "1.0.0",
-        "mode": "webhook" if os.getenv('RENDER') else "polling"
+        "mode": "webhook" if IS_RENDER else "polling"
     }
 
 @app.route('/status')
@@ -116,8 +119,8 @@ def status():
     """Bot status endpoint"""
     return {
         "bot_status": "running" if telegram_app else "not_initialized",
-        "platform": "render.com" if os.getenv('RENDER') else "local",
-        "webhook_url": f"https://{os.getenv('RENDER_EXTERNAL_HOSTNAME', 'localhost')}/webhook" if os.getenv('RENDER') else None
+        "platform": "render.com" if IS_RENDER else "local",
+        "webhook_url": RENDER_WEBHOOK_PATH_URL if IS_RENDER else None
     }
 
 @app.route('/')
@@ -132,10 +135,9 @@ def home():
 
 async def setup_webhook():
     """Set up webhook for production deployment"""
-    if telegram_app and os.getenv('RENDER'):
-        webhook_url = f"https://{os.getenv('RENDER_EXTERNAL_HOSTNAME')}/webhook"
-        await telegram_app.bot.set_webhook(webhook_url)
-        logger.info(f"Webhook set to: {webhook_url}")
+    if telegram_app and IS_RENDER:
+        await telegram_app.bot.set_webhook(RENDER_WEBHOOK_PATH_URL)
+        logger.info("Webhook set to: %s", RENDER_WEBHOOK_PATH_URL)
 
 def main():
     """Main function to run the bot"""
@@ -151,7 +153,7 @@ def main():
     logger.info("🔍 Ready to help users find the best deals!")
     
     # Check if running on Render.com
-    if os.getenv('RENDER'):
+    if IS_RENDER:
         logger.info("🚀 Running in production mode (webhook)")
         # Initialize the application
         import asyncio
@@ -159,8 +161,7 @@ def main():
         asyncio.run(setup_webhook())
         
         # Start Flask server
-        port = int(os.getenv('PORT', 5000))
-        app.run(host='0.0.0.0', port=port)
+        app.run(host=WEBAPP_HOST, port=WEBAPP_PORT)
     else:
         logger.info("🔧 Running in development mode (polling)")
         try:
@@ -170,7 +171,7 @@ def main():
                 drop_pending_updates=True
             )
         except Exception as e:
-            logger.error(f"Failed to start bot: {e}")
+            logger.error("Failed to start bot: %s", e)
             logger.info("Make sure TELEGRAM_BOT_TOKEN is set correctly")
 
 if __name__ == '__main__':
@@ -2,89 +2,104 @@
 """
 Combined startup script for Telegram Movie Bot and Web Dashboard
 
-This script starts both the Telegram bot and the web dashboard in separate processes,
-allowing users to monitor the bot status through a web interface.
+This script runs the Telegram bot and the web dashboard on a single asyncio
+event loop, allowing users to monitor the bot status through a web interface.
+On Render the dashboard's server also receives the Telegram webhook, so one
+port serves the dashboard, /health and the bot.
 """
 
 import os
 import sys
-import time
 import signal
+import asyncio
 import logging
-import threading
-import subprocess
-from multiprocessing import Process
+
+from logging_setup import configure
 
 # Configure logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO,
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-    ]
-)
+configure()
 
 logger = logging.getLogger(__name__)
 
-def run_telegram_bot():
-    """Run the Telegram bot"""
-    try:
-        logger.info("Starting Telegram Movie Bot...")
-        from main import main
-        main()
-    except Exception as e:
-        logger.error(f"Error running Telegram bot: {str(e)}")
+async def amain():
+    """Run the Telegram bot and the web dashboard side by side"""
+    from config import BOT_TOKEN, IS_RENDER, WEBAPP_HOST, WEBAPP_PORT
+    from main import build_application, start_updater
+    from web_server import attach_telegram, create_server
+
+    app = build_application()
+    if app is None:
         sys.exit(1)
 
-def run_web_dashboard():
-    """Run the web dashboard"""
+    # One server on PORT answers the dashboard, /health and the webhook
+    server = create_server(host=WEBAPP_HOST, port=WEBAPP_PORT, capture_signals=False)
+    loop = asyncio.get_running_loop()
+    if IS_RENDER:
+        attach_telegram(app, loop, f"/{BOT_TOKEN}")
+
+    def request_shutdown():
+        """Ask uvicorn to exit; a second signal skips its graceful wait"""
+        if server.should_exit:
+            server.force_exit = True
+        logger.info("Received shutdown signal, stopping services...")
+        server.should_exit = True
+
+    # Signals only flag the server, so the cleanup below runs uncancelled
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, request_shutdown)
+        except NotImplementedError:
+            # Windows event loops have no signal handler support
+            pass
+
+    logger.info("Starting Telegram Movie Bot...")
+    async with app:
+        await app.start()
+        try:
+            await start_updater(app)
+
+            logger.info("Starting Web Dashboard...")
+            logger.info("Dashboard available at: http://localhost:%s", WEBAPP_PORT)
+
+            # Returns once request_shutdown() flags the server
+            await server.serve()
+        finally:
+            # Updater.stop() raises if the updater never started
+            if app.updater.running:
+                await app.updater.stop()
+            await app.stop()
+            logger.info("Telegram bot stopped")
+
+def run(coro):
+    """Run a coroutine on uvloop when it is installed, else on asyncio's loop"""
     try:
-        logger.info("Starting Web Dashboard...")
-        from web_server import app
-        app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
-    except Exception as e:
-        logger.error(f"Error running web dashboard: {str(e)}")
-        sys.exit(1)
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
 
-def signal_handler(signum, frame):
-    """Handle shutdown signals"""
-    logger.info("Received shutdown signal, stopping services...")
-    sys.exit(0)
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(coro)
 
 def main():
     """Main function to start both services"""
-    # Register signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-    
     # Check required environment variables
     required_vars = ['TELEGRAM_BOT_TOKEN']
     missing_vars = [var for var in required_vars if not os.getenv(var)]
-    
+
     if missing_vars:
-        logger.error(f"Missing required environment variables: {', '.join(missing_vars)}")
+        logger.error("Missing required environment variables: %s", ', '.join(missing_vars))
         sys.exit(1)
-    
+
     logger.info("All required environment variables found")
     logger.info("Starting Telegram Movie Bot with Web Dashboard...")
-    
+
     try:
-        # Start web dashboard in a separate thread
-        dashboard_thread = threading.Thread(target=run_web_dashboard, daemon=True)
-        dashboard_thread.start()
-        
-        # Give dashboard time to start
-        time.sleep(2)
-        logger.info("Web Dashboard started successfully")
-        logger.info("Dashboard available at: http://localhost:5000")
-        
-        # Run Telegram bot in main thread
-        run_telegram_bot()
-        
+        run(amain())
+
     except KeyboardInterrupt:
         logger.info("Shutdown requested by user")
     except Exception as e:
-        logger.error(f"Fatal error: {str(e)}")
+        logger.error("Fatal error: %s", e)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+"""
+In-process usage statistics shared by the bot handlers and the web dashboard
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+# Most recently seen users kept for the active user count
+MAX_ACTIVE_USERS = 10_000
+
+class Counter:
+    """Integer counter with its own lock so increments are never lost"""
+
+    __slots__ = ('_n', '_lock')
+
+    def __init__(self):
+        self._n = 0
+        self._lock = threading.Lock()
+
+    def inc(self, k=1):
+        with self._lock:
+            self._n += k
+
+    def get(self):
+        return self._n
+
+@dataclass(slots=True)
+class BotStats:
+    """Bot statistics held as slot attributes rather than dict keys"""
+
+    start_time: float = field(default_factory=time.monotonic)
+    total_searches: Counter = field(default_factory=Counter)
+    images_sent: Counter = field(default_factory=Counter)
+    last_activity: float | None = None
+    active_users: OrderedDict = field(default_factory=OrderedDict)
+    users_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, searches=0, images=0, users=()):
+        """Apply a batch of statistic updates"""
+        if not (searches or images or users):
+            return
+        if searches:
+            self.total_searches.inc(searches)
+        if images:
+            self.images_sent.inc(images)
+        if users:
+            active_users = self.active_users
+            with self.users_lock:
+                for user_id in users:
+                    user_id = str(user_id)
+                    active_users[user_id] = None
+                    active_users.move_to_end(user_id)
+                while len(active_users) > MAX_ACTIVE_USERS:
+                    active_users.popitem(last=False)
+        self.last_activity = time.time()
+
+    def inc_search(self, n=1):
+        """Count product searches"""
+        self.total_searches.inc(n)
+        self.last_activity = time.time()
+
+    def inc_image(self, n=1):
+        """Count product images sent"""
+        self.images_sent.inc(n)
+        self.last_activity = time.time()
+
+    def track_user(self, user_id):
+        """Mark a user as active"""
+        self.record(users=(user_id,))
+
+    def snapshot(self):
+        """Return a copy of the current statistics"""
+        return {
+            'start_time': self.start_time,
+            'total_searches': self.total_searches.get(),
+            'active_users': len(self.active_users),
+            'images_sent': self.images_sent.get(),
+            'last_activity': self.last_activity
+        }
+
+# Store bot statistics
+bot_stats = BotStats()
+
+record = bot_stats.record
+inc_search = bot_stats.inc_search
+inc_image = bot_stats.inc_image
+track_user = bot_stats.track_user
+snapshot = bot_stats.snapshot
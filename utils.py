@@ -8,8 +8,6 @@ from mock_data import format_price, calculate_savings
 
 def format_deal_message(product, platform=None):
     """Format a deal message for display"""
-    message_parts = []
-    
     if platform and platform != 'all':
         # Single platform deal
         deal = product['deals'].get(platform)
@@ -2,60 +2,100 @@
 """
 Web Status Dashboard for Telegram Movie Bot
 
-A Flask web server that provides a status dashboard showing the bot's
-current status, statistics, and available commands.
+A Flask app, served by uvicorn, that provides a status dashboard showing
+the bot's current status, statistics, and available commands. It is the
+only web app in the bot process and also answers the /health check.
 """
 
-from flask import Flask, render_template, jsonify
-import psutil
-import os
+from flask import Flask, Response, request
+from functools import lru_cache
+import contextlib
+import orjson
+import hashlib
 import time
 from datetime import datetime
 import logging
 
+import stats
+from logging_setup import configure
+
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+configure()
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
-# Store bot statistics
-bot_stats = {
-    'start_time': time.time(),
-    'total_searches': 0,
-    'active_users': set(),
-    'images_sent': 0,
-    'last_activity': None
+def _json_response(data):
+    """Serialize data with orjson into a JSON response"""
+    return Response(orjson.dumps(data), mimetype='application/json')
+
+# Cached system readings, refreshed at most every SYS_CACHE_TTL seconds
+SYS_CACHE_TTL = 2.0
+_sys_cache = {
+    'ts': None,
+    'cpu': 0.0,
+    'mem': None
 }
 
+def _sys_snapshot(ttl=SYS_CACHE_TTL):
+    """Return cached (cpu_percent, virtual_memory) readings without blocking"""
+    import psutil
+
+    now = time.monotonic()
+    if _sys_cache['ts'] is None or now - _sys_cache['ts'] > ttl:
+        # interval=None compares against the previous call instead of sleeping
+        _sys_cache['cpu'] = psutil.cpu_percent(interval=None)
+        _sys_cache['mem'] = psutil.virtual_memory()
+        _sys_cache['ts'] = now
+    return _sys_cache['cpu'], _sys_cache['mem']
+
+# Seconds browsers may reuse the dashboard page before revalidating
+INDEX_MAX_AGE = 300
+
+@lru_cache(maxsize=1)
+def _index_page():
+    """Render index.html once and return its (body, etag)"""
+    body = app.jinja_env.get_template('index.html').render().encode()
+    return body, hashlib.md5(body, usedforsecurity=False).hexdigest()
+
 @app.route('/')
 def dashboard():
-    """Render the main dashboard page"""
-    return render_template('index.html')
+    """Serve the pre-rendered dashboard page"""
+    body, etag = _index_page()
+    response = Response(body, mimetype='text/html')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = INDEX_MAX_AGE
+    return response.make_conditional(request)
 
 @app.route('/api/status')
 def get_status():
     """API endpoint to get current bot status"""
     try:
+        current = stats.snapshot()
+        
         # Calculate uptime
-        uptime_seconds = int(time.time() - bot_stats['start_time'])
+        uptime_seconds = int(time.monotonic() - current['start_time'])
         uptime_hours = uptime_seconds // 3600
         uptime_minutes = (uptime_seconds % 3600) // 60
         uptime_secs = uptime_seconds % 60
         uptime_str = f"{uptime_hours}h {uptime_minutes}m {uptime_secs}s"
         
+        last_activity = current['last_activity']
+        if last_activity is not None:
+            last_activity = datetime.fromtimestamp(last_activity).isoformat()
+        
         # Get system stats
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
+        cpu_percent, memory = _sys_snapshot()
         
         status_data = {
             'bot_status': 'online',
             'uptime': uptime_str,
             'last_update': datetime.now().isoformat(),
-            'total_searches': bot_stats['total_searches'],
-            'active_users': len(bot_stats['active_users']),
-            'images_sent': bot_stats['images_sent'],
-            'last_activity': bot_stats['last_activity'],
+            'total_searches': current['total_searches'],
+            'active_users': current['active_users'],
+            'images_sent': current['images_sent'],
+            'last_activity': last_activity,
             'system': {
                 'cpu_percent': cpu_percent,
                 'memory_percent': memory.percent,
@@ -69,79 +109,135 @@ def get_status():
             }
         }
         
-        return jsonify(status_data)
+        return _json_response(status_data)
         
     except Exception as e:
-        logger.error(f"Error getting status: {str(e)}")
-        return jsonify({
+        logger.error("Error getting status: %s", e)
+        return _json_response({
             'bot_status': 'error',
             'error': str(e)
         }), 500
 
-@app.route('/api/stats/increment/<stat_type>')
-def increment_stat(stat_type):
-    """API endpoint to increment statistics"""
+@app.route('/api/stats/batch', methods=['POST'])
+def record_stats_batch():
+    """API endpoint to record many statistic events in one request"""
     try:
-        if stat_type == 'search':
-            bot_stats['total_searches'] += 1
-        elif stat_type == 'image':
-            bot_stats['images_sent'] += 1
-        
-        bot_stats['last_activity'] = datetime.now().isoformat()
-        
-        return jsonify({'status': 'success', 'value': bot_stats.get(f'total_{stat_type}s', 0)})
-        
-    except Exception as e:
-        logger.error(f"Error incrementing stat {stat_type}: {str(e)}")
-        return jsonify({'status': 'error', 'error': str(e)}), 500
-
-@app.route('/api/stats/user/<user_id>')
-def track_user(user_id):
-    """API endpoint to track active users"""
+        payload = orjson.loads(request.get_data() or b'{}')
+    except orjson.JSONDecodeError:
+        return _json_response({'status': 'error', 'error': 'Body must be valid JSON'}), 400
+    
+    error = _validate_stats_batch(payload)
+    if error:
+        return _json_response({'status': 'error', 'error': error}), 400
+    
     try:
-        bot_stats['active_users'].add(user_id)
-        bot_stats['last_activity'] = datetime.now().isoformat()
+        stats.record(
+            searches=payload.get('searches', 0),
+            images=payload.get('images', 0),
+            users=payload.get('users', ())
+        )
         
-        return jsonify({
-            'status': 'success', 
-            'active_users': len(bot_stats['active_users'])
-        })
+        return _json_response({'status': 'success'})
         
     except Exception as e:
-        logger.error(f"Error tracking user {user_id}: {str(e)}")
-        return jsonify({'status': 'error', 'error': str(e)}), 500
+        logger.error("Error recording stats batch: %s", e)
+        return _json_response({'status': 'error', 'error': 'Internal server error'}), 500
+
+def _validate_stats_batch(payload):
+    """Return an error message for a malformed stats batch, or None"""
+    if not isinstance(payload, dict):
+        return 'Body must be a JSON object'
+    
+    for key in ('searches', 'images'):
+        value = payload.get(key, 0)
+        if type(value) is not int or value < 0:
+            return f"'{key}' must be a non-negative integer"
+    
+    users = payload.get('users', [])
+    if not isinstance(users, list):
+        return "'users' must be a list"
+    if any(type(user_id) not in (int, str) for user_id in users):
+        return "'users' must contain only integers or strings"
+    
+    return None
+
+def attach_telegram(application, loop, path):
+    """Serve Telegram webhook POSTs on path, feeding application's update queue
+
+    Flask views run on worker threads, so updates are handed to the bot's
+    event loop with call_soon_threadsafe.
+    """
+    from telegram import Update
+
+    def telegram_webhook():
+        try:
+            update = Update.de_json(orjson.loads(request.get_data()), application.bot)
+            loop.call_soon_threadsafe(application.update_queue.put_nowait, update)
+
+            return "OK", 200
+        except Exception as e:
+            logger.error("Error processing webhook: %s", e)
+            return "Error", 500
+
+    app.add_url_rule(path, 'telegram_webhook', telegram_webhook, methods=['POST'])
 
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return _json_response({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
-        'uptime': int(time.time() - bot_stats['start_time'])
+        'uptime': int(time.monotonic() - stats.bot_stats.start_time)
     })
 
 @app.errorhandler(404)
 def page_not_found(e):
     """Handle 404 errors"""
-    return render_template('index.html'), 404
+    return Response(_index_page()[0], status=404, mimetype='text/html')
 
 @app.errorhandler(500)
 def internal_server_error(e):
     """Handle 500 errors"""
-    logger.error(f"Internal server error: {str(e)}")
-    return jsonify({'error': 'Internal server error'}), 500
+    logger.error("Internal server error: %s", e)
+    return _json_response({'error': 'Internal server error'}), 500
+
+def create_server(host='0.0.0.0', port=5000, capture_signals=True):
+    """Create a uvicorn server hosting the dashboard through an ASGI adapter
+
+    Pass capture_signals=False when the caller owns SIGINT/SIGTERM and stops
+    the server by setting its should_exit flag.
+    """
+    import psutil
+    import uvicorn
+    from a2wsgi import WSGIMiddleware
+
+    # Prime the CPU sampler so the first /api/status reports a real delta
+    psutil.cpu_percent(interval=None)
+
+    # loop/http 'auto' use uvloop and httptools whenever they are installed
+    server = uvicorn.Server(uvicorn.Config(
+        WSGIMiddleware(app),
+        host=host,
+        port=port,
+        interface='asgi3',
+        lifespan='off',
+        loop='auto',
+        http='auto',
+        access_log=False
+    ))
+    if not capture_signals:
+        server.capture_signals = contextlib.nullcontext
+    return server
+
+def serve(host='0.0.0.0', port=5000):
+    """Run the dashboard on uvicorn instead of the Flask development server"""
+    create_server(host, port).run()
 
 if __name__ == '__main__':
-    # Get port from environment or default to 5000
-    port = int(os.environ.get('PORT', 5000))
+    # Port from the PORT environment variable, default 5000
+    from config import WEBAPP_HOST, WEBAPP_PORT
     
-    logger.info(f"Starting web dashboard on port {port}")
-    logger.info("Dashboard will be available at: http://localhost:5000")
+    logger.info("Starting web dashboard on port %s", WEBAPP_PORT)
+    logger.info("Dashboard will be available at: http://localhost:%s", WEBAPP_PORT)
     
-    # Start the Flask app
-    app.run(
-        host='0.0.0.0',
-        port=port,
-        debug=False,
-        threaded=True
-      )
+    serve(host=WEBAPP_HOST, port=WEBAPP_PORT)